@@ -1,104 +1,510 @@
 import os
+import json
+import asyncio
+import hashlib
+import functools
+import httpx
 import openai
 import tiktoken
 import argparse
-from typing import Dict
+from pathlib import Path
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from generators.prompt_cache import PromptCache
+from generators.rate_limiter import RateLimiter
+
+T = TypeVar("T")
+
+_UI_EXTS = (".html", ".ui", ".xml", ".css")
+
+# Failures worth another attempt. The SDK's own retries are disabled (see
+# _new_async_client), so these cover what it used to: rate limits, dropped
+# connections and timeouts (APITimeoutError subclasses APIConnectionError), and 5xx.
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Boilerplate files short enough to be generated together in one JSON completion,
+# matched by exact path: only top-level docs/manifests and the empty package markers.
+# Other __init__.py files (Flask app factories, model/schema packages) hold real code.
+_SMALL_FILES = frozenset({
+    "README.md", "requirements.txt", ".dockerignore",
+    "config/__init__.py", "tests/__init__.py",
+})
+
+# Prompts are ordered static-first so that every request for a project shares one
+# prefix. OpenAI only caches prefixes of 1024+ tokens, which with the ~300-token
+# instructions and file listing takes a long project description to reach.
+_SYSTEM_TPL = """You are a senior developer. Generate complete, production-ready code for the file described at the end of the user's message.
+- Do not include TODOs, placeholders, or stub functions."""
+
+_BATCH_SYSTEM_TPL = """You are a senior developer. Generate complete, production-ready code for every file listed at the end of the user's message.
+- Do not include TODOs, placeholders, or stub functions.
+Return a JSON object where each key is a filepath and value is the complete file contents."""
+
+# Shared by every request of a project and placed before the per-file part.
+_PROJECT_TPL = """{prompt}
+
+Project files:
+{file_list}"""
+
+_FILE_TPL = """Create this file:
+- File: {file_path}
+- Purpose: {file_description}
+- Max {max_lines} lines / Max {max_tokens} tokens"""
+
+_STRICT_SUFFIX = "\n- Must be ≥ {min_lines} lines and ≥ {min_tokens} tokens."
+
+_DETAILED_SUFFIX = """
+- Use the full available line and token budget.
+- Add as much functionality, UI structure, helper functions, and refinements as possible.
+- Include comments to explain logic where helpful.
+- Think like an engineer delivering a top-tier production file.
+- Add extras like accessibility, error handling, modularity, etc., where appropriate."""
+
+
+def _count_lines(code: str) -> int:
+    # Same result as len(code.splitlines()) for \n-terminated text, without building the list.
+    return code.count("\n") + (1 if code and not code.endswith("\n") else 0)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tok() -> tiktoken.Encoding:
+    return tiktoken.get_encoding("cl100k_base")
+
+
+@functools.lru_cache(maxsize=2048)
+def _count_tokens(s: str) -> int:
+    # Prompts and generated code may contain text such as "<|endoftext|>";
+    # count it as plain text instead of letting encode() reject it.
+    return len(_get_tok().encode_ordinary(s))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_prompt_cache() -> PromptCache:
+    cache_dir = Path(os.getenv("AICODER_CACHE_DIR", "~/.ai-coder/cache"))
+    return PromptCache(cache_dir / "prompt_cache.sqlite3")
+
+
+def _new_async_client(api_key: Optional[str]) -> openai.AsyncOpenAI:
+    # Retries are handled by CodeGenerator._acomplete so that they go back through the rate limiter.
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        max_retries=0,
+        http_client=openai.DefaultAsyncHttpxClient(
+            # HTTP/2 multiplexes the concurrent per-file streams over a few TLS connections.
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        )
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_async_client(api_key: Optional[str]) -> openai.AsyncOpenAI:
+    return _new_async_client(api_key)
+
+
+def _new_rate_limiter() -> RateLimiter:
+    return RateLimiter(
+        max_requests_per_minute=int(os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", "500")),
+        max_tokens_per_minute=int(os.getenv("OPENAI_MAX_TOKENS_PER_MINUTE", "450000"))
+    )
+
 
 class CodeGenerator:
-    def __init__(self, api_key: str = None, strict_mode: bool = False, detailed_mode: bool = False):
-        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
+    def __init__(self, api_key: str = None, strict_mode: bool = False, detailed_mode: bool = False, max_concurrency: Optional[int] = None, batch_small_files: bool = True):
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.aclient = _get_async_client(api_key)
+        _get_tok()  # loads the encoding up front so the first request does not pay for it
+        self.model = "gpt-4.1"
+        self.temperature = 0.2
         self.max_lines = 50000
         self.strict_mode = strict_mode
         self.detailed_mode = detailed_mode
+        self.max_concurrency = max_concurrency or int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+        self.batch_small_files = batch_small_files
+        self.max_attempts = 5
+        self.rate_limiter = _new_rate_limiter()
+        self._cache: "OrderedDict[str, Tuple[str, int, int]]" = OrderedDict()
+        self.cache_size = 1024
+        self.prompt_cache = _get_prompt_cache()
+        self.system_prompt = _SYSTEM_TPL + (_DETAILED_SUFFIX if detailed_mode else "")
+        self.batch_system_prompt = _BATCH_SYSTEM_TPL + (_DETAILED_SUFFIX if detailed_mode else "")
 
     def _calculate_limits(self, file_count: int) -> tuple:
         max_tokens = 32000
         max_lines_per_file = min(5000, self.max_lines // file_count)
         return max_tokens, max_lines_per_file
 
-    def _is_ui_file(self, file_path: str) -> bool:
-        return (
-            "ui" in file_path.lower()
-            or "screen" in file_path.lower()
-            or "window" in file_path.lower()
-            or file_path.endswith((".html", ".ui", ".xml", ".css"))
-        )
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _is_ui_file(file_path: str) -> bool:
+        p = file_path.lower()
+        return "ui" in p or "screen" in p or "window" in p or p.endswith(_UI_EXTS)
 
-    def _build_prompt(self, file_path: str, file_description: str, max_lines: int, max_tokens: int, min_lines: int, min_tokens: int) -> str:
-        system_prompt = f"""You are a senior developer. Generate complete, production-ready code for:
-- File: {file_path}
-- Purpose: {file_description}
-- Max {max_lines} lines / Max {max_tokens} tokens
-- Do not include TODOs, placeholders, or stub functions."""
+    def _project_context(self, prompt: str, file_structure: List[Tuple[str, str]]) -> str:
+        # The full layout tells each file its siblings' paths, so imports and references agree.
+        file_list = "\n".join(f"- {file_path}: {desc}" for file_path, desc in file_structure)
+        return _PROJECT_TPL.format(prompt=prompt, file_list=file_list)
 
-        if self.strict_mode:
-            system_prompt += f"\n- Must be ≥ {min_lines} lines and ≥ {min_tokens} tokens."
+    def _build_prompt(self, prompt: str, file_path: str, file_description: str, max_lines: int, max_tokens: int, min_lines: int, min_tokens: int) -> str:
+        # The project context is shared by every file, so it goes before the file-specific part.
+        return "".join((
+            prompt,
+            "\n\n",
+            _FILE_TPL.format(file_path=file_path, file_description=file_description, max_lines=max_lines, max_tokens=max_tokens),
+            _STRICT_SUFFIX.format(min_lines=min_lines, min_tokens=min_tokens) if self.strict_mode else ""
+        ))
 
-        if self.detailed_mode:
-            system_prompt += """
-- Use the full available line and token budget.
-- Add as much functionality, UI structure, helper functions, and refinements as possible.
-- Include comments to explain logic where helpful.
-- Think like an engineer delivering a top-tier production file.
-- Add extras like accessibility, error handling, modularity, etc., where appropriate."""
+    def _build_batch_prompt(self, prompt: str, group: List[Tuple[str, str]], max_lines: int) -> str:
+        file_list = "\n".join(f"- {file_path}: {desc} (max {max_lines} lines)" for file_path, desc in group)
+        return f"{prompt}\n\nCreate these files:\n{file_list}"
+
+    def _run_sync(self, make_coro: Callable[[], Awaitable[T]]) -> T:
+        # asyncio.run starts a new event loop per call, while the shared client's
+        # connection pool and the limiter's lock stay bound to the loop that first
+        # used them. Each sync call therefore runs on its own client and limiter.
+        async def run() -> T:
+            shared = self.aclient, self.rate_limiter
+            self.aclient = _new_async_client(shared[0].api_key)
+            self.rate_limiter = _new_rate_limiter()
+            try:
+                return await make_coro()
+            finally:
+                await self.aclient.close()
+                self.aclient, self.rate_limiter = shared
 
-        return system_prompt
+        return asyncio.run(run())
 
     def generate_file(self, prompt: str, file_description: str, file_num: int, total_files: int, file_path: str) -> str:
+        code, _, _ = self._run_sync(lambda: self._agenerate_file(prompt, file_description, file_num, total_files, file_path))
+        return code
+
+    async def _acomplete(self, messages: List[Dict[str, str]], max_tokens: int, **kwargs):
+        estimated_tokens = max_tokens + sum(_count_tokens(m["content"]) for m in messages)
+
+        for attempt in range(self.max_attempts):
+            await self.rate_limiter.acquire(estimated_tokens)
+            try:
+                return await self.aclient.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=max_tokens,
+                    top_p=0.9,
+                    **kwargs
+                )
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                reason = "Rate limited" if isinstance(e, openai.RateLimitError) else type(e).__name__
+                print(f"⏳ {reason}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+
+    def _cache_key(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{self.model}|{self.temperature}|{max_tokens}|".encode())
+        h.update(system_prompt.encode() + b"|" + user_prompt.encode())
+        return h.hexdigest()
+
+    def _remember(self, key: str, entry: Tuple[str, int, int]) -> None:
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _cache_get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        # In-memory LRU first, then the on-disk PromptCache shared across restarts.
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry
+
+        entry = await asyncio.to_thread(self.prompt_cache.get, key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def _cache_put(self, key: str, entry: Tuple[str, int, int]) -> None:
+        self._remember(key, entry)
+        await asyncio.to_thread(self.prompt_cache.set, key, entry)
+
+    def _min_size(self, file_path: str) -> Tuple[int, int]:
+        if self._is_ui_file(file_path):
+            return 500, 2000
+        return 20, 300
+
+    async def _agenerate_file(self, prompt: str, file_description: str, file_num: int, total_files: int, file_path: str) -> Tuple[str, int, int]:
         max_tokens, max_lines = self._calculate_limits(total_files)
-        is_ui_file = self._is_ui_file(file_path)
+        min_lines, min_tokens = self._min_size(file_path)
 
-        min_lines = 500 if is_ui_file else 20
-        min_tokens = 2000 if is_ui_file else 300
+        user_prompt = self._build_prompt(prompt, file_path, file_description, max_lines, max_tokens, min_lines, min_tokens)
 
-        for attempt in range(1, 4):  # Retry up to 3x
-            system_prompt = self._build_prompt(file_path, file_description, max_lines, max_tokens, min_lines, min_tokens)
+        cache_key = self._cache_key(self.system_prompt, user_prompt, max_tokens)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            print(f"♻️ Reused cached {file_path}")
+            return cached
 
-            response = self.client.chat.completions.create(
-                model="gpt-4.1",
+        for attempt in range(1, 4):  # Retry up to 3x
+            stream = await self._acomplete(
                 messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{prompt}\n\nCreate this file: {file_description}"}
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.2,
                 max_tokens=max_tokens,
-                top_p=0.9
+                stream=True,
+                stream_options={"include_usage": True}
             )
 
-            code = response.choices[0].message.content
-            line_count = len(code.splitlines())
-            token_count = len(self.tokenizer.encode(code))
+            chunks = []
+            newlines = 0
+            token_count = 0
+            async for chunk in stream:
+                if chunk.usage:
+                    token_count = chunk.usage.completion_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    newlines += delta.count("\n")
+
+            code = "".join(chunks)
+            line_count = newlines + (1 if code and not code.endswith("\n") else 0)
 
             if self.strict_mode and (line_count < min_lines or token_count < min_tokens):
                 print(f"⚠️ Attempt {attempt}: {file_path} too short ({line_count} lines, {token_count} tokens)... retrying.")
                 continue
 
             print(f"📊 Generated {line_count} lines ({token_count} tokens) for {file_path}")
-            return code
+            await self._cache_put(cache_key, (code, line_count, token_count))
+            return code, line_count, token_count
 
         raise ValueError(
             f"❌ {file_path} failed to meet requirements after 3 attempts."
         )
 
-    def generate_project(self, prompt: str, file_structure: Dict[str, str]) -> Dict[str, str]:
+    def _project_jobs(self, prompt: str, file_structure: List[Tuple[str, str]]) -> List[Awaitable[List[Tuple[str, str, int]]]]:
+        # One coroutine per substantive file plus one for the grouped boilerplate files;
+        # each resolves to (file_path, code, line_count) entries.
         total_files = len(file_structure)
-        results = {}
-
-        for i, (file_path, desc) in enumerate(file_structure.items(), 1):
-            results[file_path] = self.generate_file(
-                prompt=prompt,
-                file_description=desc,
-                file_num=i,
-                total_files=total_files,
-                file_path=file_path
-            )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        context = self._project_context(prompt, file_structure)
+
+        # Strict mode checks each file's size individually, so it never groups.
+        small = []
+        if self.batch_small_files and not self.strict_mode:
+            small = [(file_path, desc) for file_path, desc in file_structure if file_path in _SMALL_FILES]
+        if len(small) < 2:
+            small = []
+        small_paths = {file_path for file_path, _ in small}
+
+        async def bounded(file_num: int, file_path: str, desc: str) -> List[Tuple[str, str, int]]:
+            async with semaphore:
+                code, line_count, _ = await self._agenerate_file(
+                    prompt=context,
+                    file_description=desc,
+                    file_num=file_num,
+                    total_files=total_files,
+                    file_path=file_path
+                )
+            return [(file_path, code, line_count)]
+
+        async def bounded_group() -> List[Tuple[str, str, int]]:
+            async with semaphore:
+                return await self._agenerate_group(context, small, total_files)
+
+        jobs = [
+            bounded(i, file_path, desc)
+            for i, (file_path, desc) in enumerate(file_structure, 1)
+            if file_path not in small_paths
+        ]
+        if small:
+            jobs.append(bounded_group())
+        return jobs
+
+    async def agenerate_project(self, prompt: str, file_structure: List[Tuple[str, str]]) -> Dict[str, str]:
+        jobs = self._project_jobs(prompt, file_structure)
+        generated = {entry[0]: entry for entries in await asyncio.gather(*jobs) for entry in entries}
+        return self._apply_line_budget(generated[file_path] for file_path, _ in file_structure)
+
+    async def aiter_project(self, prompt: str, file_structure: List[Tuple[str, str]]) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (file_path, code) in declaration order, so callers can write while the rest generate.
+
+        A finished file is held back until every file declared before it is
+        done, which keeps the line budget identical to agenerate_project's.
+        Once the budget is spent the outstanding requests are cancelled.
+        """
+        tasks = [asyncio.ensure_future(job) for job in self._project_jobs(prompt, file_structure)]
+        done: Dict[str, Tuple[str, str, int]] = {}
+        next_index = 0
+        total_lines = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for entry in await next_done:
+                    done[entry[0]] = entry
+                while next_index < len(file_structure) and file_structure[next_index][0] in done:
+                    file_path, code, line_count = done.pop(file_structure[next_index][0])
+                    next_index += 1
+                    yield file_path, code
+                    total_lines += line_count
+                    if total_lines > 45000:
+                        print("⚠️ Approaching 50K line limit - truncating project")
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def generate_project(self, prompt: str, file_structure: List[Tuple[str, str]]) -> Dict[str, str]:
+        return self._run_sync(lambda: self.agenerate_project(prompt, file_structure))
+
+    @staticmethod
+    def _parse_group(content: str, group: List[Tuple[str, str]]) -> Dict[str, str]:
+        files = json.loads(content)
+        if not isinstance(files, dict):
+            raise ValueError("response is not a JSON object")
+        missing = [file_path for file_path, _ in group if not isinstance(files.get(file_path), str)]
+        if missing:
+            raise ValueError(f"response is missing {', '.join(missing)}")
+        return files
+
+    async def _agenerate_group(self, prompt: str, group: List[Tuple[str, str]], total_files: int) -> List[Tuple[str, str, int]]:
+        max_tokens, max_lines = self._calculate_limits(total_files)
+        user_prompt = self._build_batch_prompt(prompt, group, max_lines)
+
+        # The whole JSON reply is cached as one entry, keyed like a single-file request.
+        cache_key = self._cache_key(self.batch_system_prompt, user_prompt, max_tokens)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            files = self._parse_group(cached[0], group)
+            print(f"♻️ Reused cached {', '.join(file_path for file_path, _ in group)}")
+        else:
+            for attempt in range(1, 4):  # Retry up to 3x
+                response = await self._acomplete(
+                    messages=[
+                        {"role": "system", "content": self.batch_system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"}
+                )
+                content = response.choices[0].message.content or ""
+                try:
+                    files = self._parse_group(content, group)
+                    break
+                except ValueError as e:  # includes truncated JSON
+                    print(f"⚠️ Attempt {attempt}: batched response unusable ({e})... retrying.")
+            else:
+                raise ValueError(
+                    f"❌ Batched files {', '.join(file_path for file_path, _ in group)} failed after 3 attempts."
+                )
+
+            token_count = response.usage.completion_tokens if response.usage else 0
+            await self._cache_put(cache_key, (content, _count_lines(content), token_count))
+
+        generated = []
+        for file_path, _ in group:
+            code = files[file_path]
+            line_count = _count_lines(code)
+            print(f"📊 Generated {line_count} lines for {file_path} (batched)")
+            generated.append((file_path, code, line_count))
+        return generated
+
+    async def agenerate_project_batched(self, prompt: str, file_structure: List[Tuple[str, str]], group_size: int = 5) -> Dict[str, str]:
+        # One request per group of files; groups stay small enough that the
+        # combined output fits inside a single completion's token budget.
+        groups = [file_structure[i:i + group_size] for i in range(0, len(file_structure), group_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        context = self._project_context(prompt, file_structure)
+
+        async def bounded(group: List[Tuple[str, str]]) -> List[Tuple[str, str, int]]:
+            async with semaphore:
+                return await self._agenerate_group(context, group, len(file_structure))
+
+        generated = await asyncio.gather(*(bounded(group) for group in groups))
+        return self._apply_line_budget(entry for group_result in generated for entry in group_result)
+
+    def generate_project_batched(self, prompt: str, file_structure: List[Tuple[str, str]], group_size: int = 5) -> Dict[str, str]:
+        return self._run_sync(lambda: self.agenerate_project_batched(prompt, file_structure, group_size))
+
+    async def asubmit_batch(self, prompt: str, file_structure: List[Tuple[str, str]], metadata: Optional[Dict[str, str]] = None) -> str:
+        # Batch jobs trade a completion window of up to 24h for half-price tokens
+        # and a separate rate-limit pool, so they bypass the RateLimiter.
+        max_tokens, max_lines = self._calculate_limits(len(file_structure))
+        context = self._project_context(prompt, file_structure)
+        lines = []
+        for index, (file_path, desc) in enumerate(file_structure):
+            min_lines, min_tokens = self._min_size(file_path)
+            lines.append(json.dumps({
+                # Output order isn't guaranteed; the index restores declaration order.
+                "custom_id": f"{index}:{file_path}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": self._build_prompt(context, file_path, desc, max_lines, max_tokens, min_lines, min_tokens)}
+                    ],
+                    "temperature": self.temperature,
+                    "max_tokens": max_tokens,
+                    "top_p": 0.9
+                }
+            }))
+
+        batch_file = await self.aclient.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.aclient.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata=metadata
+        )
+        print(f"📦 Submitted batch {batch.id} with {len(lines)} files")
+        return batch.id
+
+    async def aretrieve_batch(self, batch_id: str) -> Tuple[object, Optional[Dict[str, str]]]:
+        batch = await self.aclient.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return batch, None
+        if batch.request_counts and batch.request_counts.failed:
+            raise ValueError(f"❌ Batch {batch_id} finished with {batch.request_counts.failed} failed files.")
+
+        output = await self.aclient.files.content(batch.output_file_id)
+        generated = []
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if response.get("status_code") != 200:
+                raise ValueError(f"❌ {entry['custom_id']} failed in batch {batch_id}: {entry.get('error')}")
+            code = response["body"]["choices"][0]["message"]["content"]
+            index, _, file_path = entry["custom_id"].partition(":")
+            if not index.isdigit():  # submitted before custom_ids carried an index
+                index, file_path = len(generated), entry["custom_id"]
+            generated.append((int(index), file_path, code, _count_lines(code)))
+
+        generated.sort(key=lambda entry: entry[0])
+        return batch, self._apply_line_budget(entry[1:] for entry in generated)
 
-            if sum(len(c.splitlines()) for c in results.values()) > 45000:
-                print("⚠️ Approaching 50K line limit - stopping generation")
+    def _apply_line_budget(self, generated: Iterable[Tuple[str, str, int]]) -> Dict[str, str]:
+        # Files are generated concurrently, so the 50K line budget is enforced
+        # afterwards by keeping files in declaration order until it is spent.
+        kept = {}
+        total_lines = 0
+        for file_path, code, line_count in generated:
+            kept[file_path] = code
+            total_lines += line_count
+            if total_lines > 45000:
+                print("⚠️ Approaching 50K line limit - truncating project")
                 break
 
-        return results
+        return kept
 
 
 # ✅ CLI Handler
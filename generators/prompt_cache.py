@@ -0,0 +1,47 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class PromptCache:
+    """SQLite-backed store of generated files that survives restarts.
+
+    Values are (code, line_count, token_count) tuples keyed by the digest
+    CodeGenerator computes from the model, sampling settings and prompts.
+    """
+
+    def __init__(self, path: Path, expire: float = 30 * 86400):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.expire = expire
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, code TEXT NOT NULL, line_count INTEGER NOT NULL, "
+                "token_count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Tuple[str, int, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT code, line_count, token_count FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, key: str, entry: Tuple[str, int, int]) -> None:
+        code, line_count, token_count = entry
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, code, line_count, token_count, time.time() + self.expire)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,48 @@
+import time
+import asyncio
+
+
+class RateLimiter:
+    """Token bucket that keeps requests under OpenAI's RPM and TPM limits.
+
+    Both buckets refill continuously; a request is dispatched only once the
+    request bucket holds one unit and the token bucket holds its estimate.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self.last_update_time = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _replenish(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update_time
+        self.available_request_capacity = min(
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60.0,
+            float(self.max_requests_per_minute)
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60.0,
+            float(self.max_tokens_per_minute)
+        )
+        self.last_update_time = now
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        # A single request larger than the whole bucket would never fit.
+        estimated_tokens = min(estimated_tokens, self.max_tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._replenish()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= estimated_tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= estimated_tokens
+                    return
+
+                request_wait = (1 - self.available_request_capacity) * 60.0 / self.max_requests_per_minute
+                token_wait = (estimated_tokens - self.available_token_capacity) * 60.0 / self.max_tokens_per_minute
+                await asyncio.sleep(max(request_wait, token_wait, 0.001))
@@ -0,0 +1,122 @@
+import base64
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+_GH_CLIENT: Optional[httpx.AsyncClient] = None
+_GH_RETRY_STATUSES = (429, 502, 503, 504)
+# A 5xx can arrive after the write already happened, so only replay requests that are safe to repeat.
+_GH_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "PATCH", "DELETE"})
+# GitHub's secondary rate limits penalize bursts of concurrent writes.
+_GH_MAX_CONCURRENT_BLOBS = 8
+
+def github_client() -> httpx.AsyncClient:
+    # Normally opened by the app's startup hook; created on demand for other callers.
+    global _GH_CLIENT
+    if _GH_CLIENT is None:
+        _GH_CLIENT = httpx.AsyncClient(
+            base_url="https://api.github.com",
+            timeout=10,
+            headers={"Accept": "application/vnd.github.v3+json", "Accept-Encoding": "gzip"},
+            # retries= only covers connection failures; status retries are in github_request.
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+            )
+        )
+    return _GH_CLIENT
+
+async def close_github_client() -> None:
+    global _GH_CLIENT
+    if _GH_CLIENT is not None:
+        await _GH_CLIENT.aclose()
+        _GH_CLIENT = None
+
+async def github_request(method: str, url: str, retry: Optional[bool] = None, **kwargs) -> httpx.Response:
+    # retry=None retries idempotent methods only; POSTs that are safe to repeat pass retry=True.
+    if retry is None:
+        retry = method.upper() in _GH_IDEMPOTENT_METHODS
+    for attempt in range(4):
+        r = await github_client().request(method, url, **kwargs)
+        if not retry or r.status_code not in _GH_RETRY_STATUSES or attempt == 3:
+            return r
+        await asyncio.sleep(0.2 * 2 ** attempt)
+
+async def get_github_username(github_token: str) -> str:
+    headers = {"Authorization": f"token {github_token}"}
+    r = await github_request("GET", "/user", headers=headers)
+    r.raise_for_status()
+    return r.json()["login"]
+
+async def create_github_repo(repo_name: str, github_token: str) -> None:
+    headers = {"Authorization": f"token {github_token}"}
+    # The git data API can't write to an empty repository, so start it with an initial commit.
+    data = {"name": repo_name, "private": False, "auto_init": True}
+    r = await github_request("POST", "/user/repos", json=data, headers=headers)
+    if r.status_code == 422:
+        # The repo already exists (or the name is invalid); never push generated files over it.
+        raise Exception(f"GitHub repository {repo_name} already exists; choose a new repository name.")
+    r.raise_for_status()
+
+async def _head_commit(repo_path: str, branch: str, headers: Dict[str, str]) -> str:
+    # A freshly auto-initialized repo can take a moment before its branch ref is readable.
+    for attempt in range(4):
+        r = await github_request("GET", f"{repo_path}/git/ref/heads/{branch}", headers=headers)
+        if r.status_code not in (404, 409) or attempt == 3:
+            r.raise_for_status()
+            return r.json()["object"]["sha"]
+        await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def push_files(owner: str, repo_name: str, files: List[Tuple[str, bytes]], github_token: str, message: str = "Initial commit") -> str:
+    """Commit files as the full contents of the default branch; returns the new commit's sha.
+
+    Blobs are uploaded concurrently, then one tree, one commit and one ref
+    update replace what would otherwise be a request per file.
+    """
+    if not files:
+        raise Exception(f"No files to push to {owner}/{repo_name}; the project directory is empty.")
+    headers = {"Authorization": f"token {github_token}"}
+    repo_path = f"/repos/{owner}/{repo_name}"
+
+    r = await github_request("GET", repo_path, headers=headers)
+    r.raise_for_status()
+    branch = r.json()["default_branch"]
+    parent_sha = await _head_commit(repo_path, branch, headers)
+
+    # The new tree replaces the branch contents, so only build on the lone auto_init commit.
+    r = await github_request("GET", f"{repo_path}/git/commits/{parent_sha}", headers=headers)
+    r.raise_for_status()
+    if r.json()["parents"]:
+        raise Exception(f"{owner}/{repo_name} already has history on {branch}; refusing to overwrite it.")
+
+    slots = asyncio.Semaphore(_GH_MAX_CONCURRENT_BLOBS)
+
+    async def create_blob(path: str, data: bytes) -> Dict[str, str]:
+        async with slots:
+            r = await github_request(
+                "POST", f"{repo_path}/git/blobs",
+                json={"content": base64.b64encode(data).decode("ascii"), "encoding": "base64"},
+                headers=headers,
+                retry=True  # blobs are content-addressed, so a repeat returns the same sha
+            )
+        r.raise_for_status()
+        return {"path": path, "mode": "100644", "type": "blob", "sha": r.json()["sha"]}
+
+    tree = await asyncio.gather(*(create_blob(path, data) for path, data in files))
+
+    # No base_tree: the commit holds exactly these files and drops the auto_init README.
+    r = await github_request("POST", f"{repo_path}/git/trees", json={"tree": tree}, headers=headers, retry=True)
+    r.raise_for_status()
+    r = await github_request(
+        "POST", f"{repo_path}/git/commits",
+        json={"message": message, "tree": r.json()["sha"], "parents": [parent_sha]},
+        headers=headers
+    )
+    r.raise_for_status()
+    commit_sha = r.json()["sha"]
+
+    r = await github_request("PATCH", f"{repo_path}/git/refs/heads/{branch}", json={"sha": commit_sha}, headers=headers)
+    r.raise_for_status()
+    return commit_sha
@@ -0,0 +1,235 @@
+"""
+AI Coder Pro - HTTP API
+Version 3.3.1
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import orjson
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict
+
+from main import _BASE_PROJECTS_PATH, _OPENAI_KEY, AICoderPro, EliteCodeGenerator, _shared_code_gen
+from writers.file_writer import AdvancedFileWriter
+from github import close_github_client, github_client
+
+logger = logging.getLogger(__name__)
+
+# A failure that repeats more than _ERROR_LOG_BURST times within _ERROR_LOG_WINDOW
+# seconds drops to DEBUG, so a broken backend can't flood the log with tracebacks.
+_ERROR_LOG_BURST = 5
+_ERROR_LOG_WINDOW = 10.0
+_recent_errors: Dict[str, Deque[float]] = {}
+
+# Completed batches already written to disk, by batch id, with the response that was returned.
+# Later polls get the same response without downloading and rewriting the project.
+_written_batches: Dict[str, dict] = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # .env is loaded once at import; requests are still rejected by get_code_gen while the key is missing.
+    if not _OPENAI_KEY:
+        print("Error: Missing OPENAI_API_KEY in .env file; /generate requests will fail", file=sys.stderr)
+    else:
+        # Build the shared generator (OpenAI client, tokenizer, prompt cache) before the first request.
+        try:
+            await asyncio.to_thread(_shared_code_gen, strict_mode=False, detailed_mode=False)
+        except Exception as e:
+            print(f"Warning: code generator warm-up failed, retrying on first request: {e}", file=sys.stderr)
+    github_client()
+    yield
+    await close_github_client()
+
+app = FastAPI(
+    title="AI Coder Pro API",
+    description="Enterprise-grade code generation system via API",
+    version="3.3.1",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+class GenerateRequest(BaseModel):
+    # Unknown fields are rejected rather than silently dropped.
+    model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
+    prompt: str
+    features: str = ""
+    tech_stack: str = ""
+    github_repo_name: Optional[str] = None
+    github_token: Optional[str] = None
+
+def _require_openai_key() -> None:
+    if not _OPENAI_KEY:
+        raise HTTPException(status_code=500, detail="Missing OPENAI_API_KEY")
+
+async def get_code_gen() -> EliteCodeGenerator:
+    _require_openai_key()
+    return _shared_code_gen(strict_mode=False, detailed_mode=False)
+
+def _internal_error(endpoint: str, e: Exception) -> HTTPException:
+    # Must be called from an except block. Clients get an opaque id; the details go
+    # to the server log under the same id.
+    error_id = uuid.uuid4().hex
+    now = time.monotonic()
+    recent = _recent_errors.setdefault(f"{endpoint}:{type(e).__name__}", deque(maxlen=_ERROR_LOG_BURST + 1))
+    while recent and now - recent[0] > _ERROR_LOG_WINDOW:
+        recent.popleft()
+    recent.append(now)
+
+    if len(recent) <= _ERROR_LOG_BURST:
+        logger.exception("%s failed [error_id=%s]", endpoint, error_id)
+    else:
+        logger.debug("%s failed [error_id=%s]", endpoint, error_id, exc_info=True)
+    return HTTPException(status_code=500, detail={"error_id": error_id})
+
+async def _upload_in_background(coder: AICoderPro, repo_name: str, github_token: str) -> None:
+    # Runs after the response is sent, so failures can only be reported to the server log.
+    try:
+        await coder.upload_to_github(repo_name, github_token)
+        print(f"✅ Uploaded {coder.project_path} to GitHub repo {repo_name}")
+    except Exception as e:
+        print(f"Error: GitHub upload to {repo_name} failed: {e}", file=sys.stderr)
+
+@app.get("/")
+async def root():
+    return {"message": "AI Coder Pro API is running."}
+
+@app.post("/generate")
+async def generate_project(request: GenerateRequest, background_tasks: BackgroundTasks, code_gen: EliteCodeGenerator = Depends(get_code_gen)):
+    try:
+        coder = AICoderPro(code_gen=code_gen)
+
+        project_name = request.github_repo_name or ("project_" + coder._default_stamp)
+        project_full_path = _BASE_PROJECTS_PATH / project_name
+        coder.project_path = project_full_path
+        coder.file_writer = await asyncio.to_thread(AdvancedFileWriter, base_path=project_full_path)
+
+        file_structure = coder._generate_file_structure({
+            "prompt": request.prompt,
+            "features": request.features,
+            "tech_stack": request.tech_stack
+        })
+
+        # Each file is written as soon as it's released, overlapping disk I/O with the remaining completions.
+        written = []
+        writes = []
+        try:
+            async for file_path, code in coder.code_gen.aiter_project(prompt=request.prompt, file_structure=file_structure):
+                writes.append(asyncio.create_task(coder.file_writer.awrite_file(file_path, code)))
+                written.append(file_path)
+            await asyncio.gather(*writes)
+        finally:
+            # On failure, don't leave writes running against a half-generated project.
+            for write in writes:
+                write.cancel()
+            await asyncio.gather(*writes, return_exceptions=True)
+        print(f"✅ {len(written)} files written to: {project_full_path}")
+
+        upload_queued = bool(request.github_repo_name and request.github_token)
+        if upload_queued:
+            background_tasks.add_task(_upload_in_background, coder, request.github_repo_name, request.github_token)
+
+        return {
+            "message": "Project generated successfully",
+            "project_path": str(project_full_path),
+            "files": written,
+            "github_upload_queued": upload_queued
+        }
+
+    except Exception as e:
+        raise _internal_error("/generate", e)
+
+@app.post("/generate/batch")
+async def submit_batch_generation(request: GenerateRequest, code_gen: EliteCodeGenerator = Depends(get_code_gen)):
+    try:
+        coder = AICoderPro(code_gen=code_gen)
+
+        project_name = request.github_repo_name or ("project_" + coder._default_stamp)
+        file_structure = coder._generate_file_structure({
+            "prompt": request.prompt,
+            "features": request.features,
+            "tech_stack": request.tech_stack
+        })
+
+        batch_id = await coder.code_gen.asubmit_batch(
+            prompt=request.prompt,
+            file_structure=file_structure,
+            metadata={"project_name": project_name}
+        )
+
+        return {
+            "message": "Batch generation submitted",
+            "batch_id": batch_id,
+            "project_name": project_name
+        }
+
+    except Exception as e:
+        raise _internal_error("/generate/batch", e)
+
+@app.get("/generate/batch/{batch_id}")
+async def get_batch_generation(batch_id: str, code_gen: EliteCodeGenerator = Depends(get_code_gen)):
+    """Poll a batch job and write its project once the batch has completed.
+
+    Batch output is written as returned: unlike /generate with strict_mode,
+    files are not checked against the minimum line and token sizes.
+    """
+    if batch_id in _written_batches:
+        return _written_batches[batch_id]
+    try:
+        batch, generated_files = await code_gen.aretrieve_batch(batch_id)
+        if generated_files is None:
+            return {"batch_id": batch_id, "status": batch.status}
+
+        project_name = (batch.metadata or {}).get("project_name")
+        if not project_name:
+            raise HTTPException(status_code=404, detail="Batch was not submitted through /generate/batch")
+
+        project_full_path = _BASE_PROJECTS_PATH / project_name
+        file_writer = await asyncio.to_thread(AdvancedFileWriter, base_path=project_full_path)
+        await file_writer.awrite_files(generated_files)
+
+        _written_batches[batch_id] = {
+            "batch_id": batch_id,
+            "status": batch.status,
+            "message": "Project generated successfully",
+            "project_path": str(project_full_path),
+            "files": list(generated_files.keys())
+        }
+        return _written_batches[batch_id]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _internal_error("/generate/batch/{batch_id}", e)
+
+# Serialized once at import. Each request gets a fresh Response around the shared
+# bytes because middleware may edit a response's headers in place.
+_EXAMPLES_BODY = orjson.dumps({
+    "examples": [
+        {"prompt": "Create a FastAPI app with JWT authentication.", "features": "Authentication", "tech_stack": "FastAPI, SQLite"},
+        {"prompt": "Build a Flask app with contact form.", "features": "Forms, Email", "tech_stack": "Flask, SQLAlchemy"},
+        {"prompt": "Develop a Django CMS.", "features": "CMS, Blog, Comments", "tech_stack": "Django, PostgreSQL"}
+    ]
+})
+_EXAMPLES_ETAG = '"' + hashlib.sha256(_EXAMPLES_BODY).hexdigest()[:16] + '"'
+_EXAMPLES_HEADERS = {"ETag": _EXAMPLES_ETAG, "Cache-Control": "public, max-age=86400, immutable"}
+
+@app.get("/examples")
+async def get_examples(if_none_match: Optional[str] = Header(None)):
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or _EXAMPLES_ETAG in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=_EXAMPLES_HEADERS)
+    return Response(_EXAMPLES_BODY, media_type="application/json", headers=_EXAMPLES_HEADERS)
@@ -1,29 +1,99 @@
 from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Union
 import os
+import shutil
+import asyncio
+
+
+@dataclass(slots=True)
+class FilePayload:
+    """One file to write: its project-relative path and UTF-8 encoded contents."""
+    path: str
+    data: bytes
+
+    @classmethod
+    def from_text(cls, path: str, content: str) -> "FilePayload":
+        return cls(path, content.encode('utf-8'))
+
+
+def _as_payloads(files: Union[Dict[str, str], Iterable[FilePayload]]) -> List[FilePayload]:
+    if isinstance(files, dict):
+        # Generated projects repeat content (empty __init__.py files, shared headers);
+        # equal strings are encoded once and share one immutable bytes object.
+        encoded: Dict[str, bytes] = {}
+        payloads = []
+        for path, content in files.items():
+            data = encoded.get(content)
+            if data is None:
+                data = encoded[content] = content.encode('utf-8')
+            payloads.append(FilePayload(path, data))
+        return payloads
+    return list(files)
 
 class AdvancedFileWriter:
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, verbose: bool = False):
         self.base_path = Path(base_path)
+        # Per-file console output is opt-in; batch writes always print one summary line.
+        self.verbose = verbose
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Per-file paths are joined as plain strings; Path's / builds several objects per call.
+        self._base = str(self.base_path)
+        # Directories already created by this writer; a lost race only costs a redundant makedirs.
+        self._seen_dirs = {self._base}
+        # Bounds how many awrite_file calls hold a worker thread at once.
+        self._write_slots = asyncio.Semaphore(32)
 
     def write_file(self, relative_path: str, content: str):
-        full_path = self.base_path / relative_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ File written to: {full_path}")
+        full_path = os.path.join(self._base, relative_path)
+        self._ensure_dir(os.path.dirname(full_path))
+        self._write_one(FilePayload.from_text(relative_path, content))
+        if self.verbose:
+            print(f"✅ File written to: {full_path}")
+
+    async def awrite_file(self, relative_path: str, content: str):
+        async with self._write_slots:
+            await asyncio.to_thread(self.write_file, relative_path, content)
+
+    def _write_one(self, payload: FilePayload):
+        with open(os.path.join(self._base, payload.path), 'wb') as f:
+            f.write(payload.data)
+
+    def _ensure_dir(self, directory: str):
+        if directory not in self._seen_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._seen_dirs.add(directory)
+
+    def _make_parents(self, payloads: List[FilePayload]):
+        # Create every directory up front so concurrent writers never race on mkdir.
+        for parent in {os.path.dirname(os.path.join(self._base, payload.path)) for payload in payloads}:
+            self._ensure_dir(parent)
+
+    def write_files(self, files: Union[Dict[str, str], Iterable[FilePayload]]):
+        payloads = _as_payloads(files)
+        if not payloads:
+            return
+
+        self._make_parents(payloads)
+        with ThreadPoolExecutor(max_workers=min(16, len(payloads))) as pool:
+            list(pool.map(self._write_one, payloads))
+        print(f"✅ {len(payloads)} files written to: {self.base_path}")
+
+    async def awrite_files(self, files: Union[Dict[str, str], Iterable[FilePayload]]):
+        payloads = _as_payloads(files)
+        if not payloads:
+            return
 
-    def write_files(self, files: dict):
-        for relative_path, content in files.items():
-            self.write_file(relative_path, content)
+        await asyncio.to_thread(self._make_parents, payloads)
+        await asyncio.gather(*(asyncio.to_thread(self._write_one, payload) for payload in payloads))
+        print(f"✅ {len(payloads)} files written to: {self.base_path}")
 
     def clear_project_directory(self):
         if self.base_path.exists():
-            for root, dirs, files in os.walk(self.base_path, topdown=False):
-                for name in files:
-                    os.remove(Path(root) / name)
-                for name in dirs:
-                    os.rmdir(Path(root) / name)
+            shutil.rmtree(self.base_path)
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            self._seen_dirs = {self._base}
             print(f"🧹 Cleared: {self.base_path}")
         else:
             print("⚠️ Project path does not exist.")